@@ -1,11 +1,17 @@
+import asyncio
+import collections
 import logging
-import os
+import pathlib
+import sqlite3
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 from optparse import make_option
 
 import polib
 from django.conf import settings
 from django.core.management.base import BaseCommand
+from tqdm import tqdm
 
 from django_deep_translator.utils import get_translator
 
@@ -15,10 +21,29 @@ default_options = () if not hasattr(BaseCommand, 'option_list') \
     else BaseCommand.option_list
 
 
+class TranslationLimitReached(Exception):
+    """Internal sentinel raised when --limit-translations is exhausted."""
+
+
 class Command(BaseCommand):
     help = ('autotranslate all the message files that have been generated '
             'using the `makemessages` command.')
 
+    # number of applied translations between file checkpoints; the file is
+    # always saved once more when the loop exits
+    save_checkpoint = 50
+
+    # separator used to pack several short msgids into a single request;
+    # chosen to be unlikely to appear in, or be reordered by, translated
+    # text. Packed requests above this character budget fall back to the
+    # provider's batch endpoint.
+    join_separator = '\n%%\n'
+    join_max_chars = 4000
+
+    # upper bound on the in-memory translation cache; least recently used
+    # strings are evicted first (the persistent cache keeps everything)
+    cache_max_entries = 100_000
+
     option_list = default_options + (
         make_option('--locale', '-l', default=[], dest='locale', action='append',
                     help='autotranslate the message files for the given locale(s) (e.g. pt_BR). '
@@ -33,6 +58,10 @@ class Command(BaseCommand):
                     help='limit the number of translations to perform (default: no limit).'),
         make_option('--requests-per-10s', default=10, dest='requests_per_10s', type='int',
                     help='maximum number of translation requests per 10 seconds (default: 10).'),
+        make_option('--batch-size', default=50, dest='batch_size', type='int',
+                    help='number of msgids sent to the provider in a single batch request (default: 50).'),
+        make_option('--concurrency', default=None, dest='concurrency', type='int',
+                    help='number of concurrent batch requests (default: requests-per-10s).'),
     )
 
     def add_arguments(self, parser):
@@ -53,6 +82,10 @@ class Command(BaseCommand):
                             help='limit the number of translations to perform (default: no limit).')
         parser.add_argument('--requests-per-10s', default=10, dest='requests_per_10s', type=int,
                             help='maximum number of translation requests per 10 seconds (default: 10).')
+        parser.add_argument('--batch-size', default=50, dest='batch_size', type=int,
+                            help='number of msgids sent to the provider in a single batch request (default: 50).')
+        parser.add_argument('--concurrency', default=None, dest='concurrency', type=int,
+                            help='number of concurrent batch requests (default: requests-per-10s).')
 
     def set_options(self, **options):
         self.locale = options['locale']
@@ -61,117 +94,397 @@ class Command(BaseCommand):
         self.source_language = options['source_language']
         self.limit_translations = options['limit_translations']
         self.requests_per_10s = options['requests_per_10s']
+        self.batch_size = options['batch_size']
+        self.concurrency = options['concurrency'] or self.requests_per_10s
         
-        # Rate limiting variables
+        # Rate limiting variables: a token bucket holding up to
+        # `requests_per_10s` tokens, refilled continuously at that rate
         self.translated_count = 0
-        self.request_times = []
 
-    def wait_for_rate_limit(self):
-        """Wait if necessary to respect the requests per 10 seconds limit."""
-        current_time = time.time()
-        
-        # Remove requests older than 10 seconds
-        self.request_times = [t for t in self.request_times if current_time - t < 10]
-        
-        # If we've reached the limit, wait until we can make another request
-        if len(self.request_times) >= self.requests_per_10s:
-            sleep_time = 10 - (current_time - self.request_times[0])
-            if sleep_time > 0:
-                logger.info(f'Rate limit reached, waiting {sleep_time:.2f} seconds...')
-                time.sleep(sleep_time)
-                # Clean up old requests again after sleeping
-                current_time = time.time()
-                self.request_times = [t for t in self.request_times if current_time - t < 10]
-        
-        # Record this request
-        self.request_times.append(current_time)
+        # shared budget of translations still allowed; batches claim from it
+        # atomically under `_count_lock` so concurrent workers can never
+        # jointly exceed the limit (None means no limit)
+        self._remaining_translations = self.limit_translations
+        self._tokens = float(self.requests_per_10s)
+        self._refill_rate = self.requests_per_10s / 10.0
+        self._last_refill = time.time()
+        self._rate_lock = threading.Lock()
+        self._count_lock = threading.Lock()
+        self._cache_mem_lock = threading.Lock()
+
+        # in-run cache of (source_language, target_language, msgid) -> msgstr,
+        # so repeated strings (button labels, "Yes"/"No", ...) cost one API
+        # call per run instead of one per occurrence; an OrderedDict in LRU
+        # order, bounded by `cache_max_entries`
+        self._translation_cache = collections.OrderedDict()
+
+    async def wait_for_rate_limit(self):
+        """Wait if necessary to respect the requests per 10 seconds limit.
+
+        Implemented as a token bucket: tokens refill continuously at
+        `requests_per_10s / 10` per second, so requests are spaced evenly
+        instead of bursting and then stalling on a window boundary. The
+        bookkeeping is guarded by a lock so concurrent callers share one
+        budget; the wait itself is an `asyncio.sleep` so other in-flight
+        requests keep running while we back off.
+        """
+        while True:
+            with self._rate_lock:
+                now = time.time()
+
+                # refill for the time elapsed since the last caller, capped
+                # at the bucket capacity
+                self._tokens = min(float(self.requests_per_10s),
+                                   self._tokens + (now - self._last_refill) * self._refill_rate)
+                self._last_refill = now
+
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+
+                sleep_time = (1 - self._tokens) / self._refill_rate
+
+            logger.info(f'Rate limit reached, waiting {sleep_time:.2f} seconds...')
+            await asyncio.sleep(sleep_time)
+
+    def _cache_remember(self, key, msgstr):
+        """insert a key into the in-memory LRU, evicting the oldest entries"""
+        with self._cache_mem_lock:
+            self._translation_cache[key] = msgstr
+            self._translation_cache.move_to_end(key)
+            while len(self._translation_cache) > self.cache_max_entries:
+                self._translation_cache.popitem(last=False)
+
+    def _cache_lookup(self, key):
+        """
+        look up a (src, tgt, msgid) key in the in-memory LRU, falling back
+        to the persistent cache and promoting hits
+        """
+        with self._cache_mem_lock:
+            msgstr = self._translation_cache.get(key)
+            if msgstr is not None:
+                self._translation_cache.move_to_end(key)
+                return msgstr
+
+        with self._cache_db_lock:
+            row = self._cache_conn.execute(
+                'SELECT msgstr FROM cache WHERE src = ? AND tgt = ? AND msgid = ?',
+                key).fetchone()
+        if row is not None:
+            self._cache_remember(key, row[0])
+            return row[0]
+        return None
+
+    def _cache_store(self, key, msgstr):
+        """record a translation in both the in-memory LRU and the persistent cache"""
+        self._cache_remember(key, msgstr)
+        with self._cache_db_lock:
+            self._cache_conn.execute('INSERT OR REPLACE INTO cache VALUES (?, ?, ?, ?)',
+                                     key + (msgstr,))
 
     def handle(self, *args, **options):
         self.set_options(**options)
 
         assert getattr(settings, 'USE_I18N', False), 'i18n framework is disabled'
         assert getattr(settings, 'LOCALE_PATHS', []), 'locale paths is not configured properly'
-        
+
+        # open the persistent translation cache; it survives across runs so
+        # an incremental makemessages run only pays for the new strings
+        cache_path = pathlib.Path(str(getattr(settings, 'BASE_DIR', '.'))) / '.translation_cache.sqlite'
+        self._cache_conn = sqlite3.connect(str(cache_path), check_same_thread=False)
+        self._cache_conn.execute('CREATE TABLE IF NOT EXISTS cache ('
+                                 'src TEXT, tgt TEXT, msgid TEXT, msgstr TEXT, '
+                                 'PRIMARY KEY (src, tgt, msgid))')
+        self._cache_db_lock = threading.Lock()
+
+        try:
+            self.translate_locale_paths()
+        finally:
+            self._cache_conn.commit()
+            self._cache_conn.close()
+
+    def translate_locale_paths(self):
         if self.limit_translations:
             logger.info(f'Translation limit set to: {self.limit_translations}')
         logger.info(f'Rate limit: {self.requests_per_10s} requests per 10 seconds')
-        
+
+
+        # group the discovered files by target language so one language is
+        # translated back-to-back: same-language strings recur across apps,
+        # which maximizes dedup-cache hits and connection reuse
+        files_by_lang = {}
         for directory in settings.LOCALE_PATHS:
-            # Check if we've reached the translation limit
-            if self.limit_translations and self.translated_count >= self.limit_translations:
-                logger.info(f'Translation limit of {self.limit_translations} reached. Stopping.')
-                return
-                
-            # walk through all the paths and find all the pot files
-            for root, dirs, files in os.walk(directory):
-                for file in files:
-                    # Check limit again in inner loop
-                    if self.limit_translations and self.translated_count >= self.limit_translations:
-                        logger.info(f'Translation limit of {self.limit_translations} reached. Stopping.')
-                        return
-                        
-                    if not file.endswith('.po'):
-                        # process file only if it is a .po file
-                        continue
+            # let the glob walk the tree and match only the .po files instead
+            # of listing every artifact in every directory ourselves
+            for po_path in pathlib.Path(directory).rglob('*.po'):
+                # get the target language from the grandparent folder name
+                # (<locale>/LC_MESSAGES/django.po)
+                target_language = po_path.parent.parent.name
 
-                    # get the target language from the parent folder name
-                    target_language = os.path.basename(os.path.dirname(root))
+                if self.locale and target_language not in self.locale:
+                    logger.info('skipping translation for locale `{}`'.format(target_language))
+                    continue
 
-                    if self.locale and target_language not in self.locale:
-                        logger.info('skipping translation for locale `{}`'.format(target_language))
-                        continue
+                files_by_lang.setdefault(target_language, []).append(po_path)
 
-                    # Pass the limit check to translate_file
-                    if not self.translate_file(root, file, target_language):
-                        # translate_file returns False when limit is reached
-                        return
+        if not files_by_lang:
+            return
+
+        def translate_language(target_language, po_paths, position):
+            # each worker owns its translator instance, so nothing about the
+            # provider's per-call state is ever shared across languages
+            translator = get_translator()
+            try:
+                for po_path in po_paths:
+                    self.translate_file(po_path, target_language, translator, position)
+            except TranslationLimitReached:
+                logger.info(f'Translation limit of {self.limit_translations} reached. Stopping.')
 
-    def translate_file(self, root, file_name, target_language):
+        # languages share no catalog state, so translate them concurrently;
+        # the token bucket, counter and caches are all lock-guarded, and
+        # each worker stops on its own once the limit budget is exhausted.
+        # Each language gets its own terminal row for its progress bars.
+        max_workers = min(8, len(files_by_lang))
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = [executor.submit(translate_language, target_language, po_paths, position)
+                       for position, (target_language, po_paths) in enumerate(files_by_lang.items())]
+            for future in futures:
+                future.result()
+
+    def translate_file(self, po_file_path, target_language, translator, progress_position=0):
         """
         convenience method for translating a po file
 
-        :param root:            the absolute path of folder where the file is present
-        :param file_name:       name of the file to be translated (it should be a pot file)
+        :param po_file_path:    path of the file to be translated (it should be a po file)
         :param target_language: language in which the file needs to be translated
-        :return:                True if completed, False if stopped due to limit
+        :param translator:      the translator service owned by this worker
+        :param progress_position: terminal row for this worker's progress bar
+        :raises TranslationLimitReached: once --limit-translations is exhausted,
+                                         after the file's work so far is saved
         """
         logger.info('filling up translations for locale `{}`'.format(target_language))
 
-        po_file_path = os.path.join(root, file_name)
-        po = polib.pofile(po_file_path)
-        
-        for entry in po:
-            # Check translation limit
-            if self.limit_translations and self.translated_count >= self.limit_translations:
-                logger.info(f'Translation limit of {self.limit_translations} reached.')
-                return False
-                
-            # skip translated
-            if self.skip_translated and entry.translated():
-                continue
-
-            # Skip empty entries
-            if not entry.msgid.strip():
-                continue
-
-            # Apply rate limiting before making translation request
-            self.wait_for_rate_limit()
-            
-            try:
-                translation = get_translator()
-                entry.msgstr = translation.translate_string(text=entry.msgid, source_language=self.source_language,
-                                                            target_language=target_language)
+        po = polib.pofile(str(po_file_path))
+
+        # collect the entries that still need a translation, then translate
+        # them in batches so one request covers `batch_size` msgids instead
+        # of one HTTP round-trip per msgid
+        # obsolete (#~) entries are kept in the catalog by polib but must
+        # never be translated; drop them with the empty msgids up front
+        pending = [entry for entry in po
+                   if not entry.obsolete
+                   and entry.msgid and entry.msgid.strip()
+                   and not (self.skip_translated and entry.translated())]
+
+        # trim the workload to the budget that is still unclaimed; this is
+        # only an optimistic cut to avoid queuing doomed work - the binding
+        # reservation happens per batch under the lock
+        if self.limit_translations:
+            with self._count_lock:
+                pending = pending[:max(0, self._remaining_translations)]
+
+        # one progress bar per file, pinned to this worker's own terminal
+        # row so concurrent language bars don't overwrite each other; only
+        # the top row's bar is left behind on completion
+        progress = tqdm(total=len(pending), desc=target_language, unit='entry',
+                        position=progress_position, leave=progress_position == 0)
+
+        # serve already-seen msgids from the cache and only send each unique
+        # miss to the provider once; duplicates are filled in afterwards
+        seen, misses, duplicates = set(), [], []
+        cache_hits = 0
+        for entry in pending:
+            key = (self.source_language, target_language, entry.msgid)
+            cached = self._cache_lookup(key)
+            if cached is not None:
+                entry.msgstr = cached
                 if self.set_fuzzy:
                     entry.flags.append('fuzzy')
+                cache_hits += 1
+                progress.update(1)
+            elif key in seen:
+                duplicates.append(entry)
+            else:
+                seen.add(key)
+                misses.append(entry)
+
+        # the file was parsed exactly once above; everything below mutates
+        # the in-memory catalog and serialization is deferred to the
+        # checkpoints plus one final save
+        unsaved_count = 0
+        try:
+            if misses:
+                unsaved_count = asyncio.run(
+                    self._translate_po_async(po, misses, target_language, translator, progress))
+
+            # fill in duplicate occurrences from what the batches just cached
+            for entry in duplicates:
+                cached = self._cache_lookup((self.source_language, target_language, entry.msgid))
+                if cached is not None:
+                    entry.msgstr = cached
+                    if self.set_fuzzy:
+                        entry.flags.append('fuzzy')
+                    cache_hits += 1
+                    progress.update(1)
+        finally:
+            progress.close()
+
+        if cache_hits:
+            logger.info(f'Filled {cache_hits} entries from the translation cache')
+
+        if unsaved_count or cache_hits:
+            po.save()
+
+        # drop the parsed catalog (and the entry lists referencing it)
+        # before the next file is processed, so peak memory stays bounded
+        # by one file at a time
+        del po, pending, misses, duplicates
+
+        if self.limit_translations:
+            with self._count_lock:
+                exhausted = self._remaining_translations <= 0
+            if exhausted:
+                raise TranslationLimitReached
+
+    async def _translate_po_async(self, po, entries, target_language, translator, progress):
+        """
+        translate the pending entries of a parsed po file on the event loop
+
+        A shared queue feeds `concurrency` worker tasks; each worker drains
+        up to `batch_size` entries at a time and submits them as one batch
+        request, so round trips are both merged (batching) and overlapped
+        (concurrency). The blocking provider calls run on worker threads
+        while the event loop overlaps their network waits. The entries are
+        already sliced to respect `limit_translations`, so no per-entry
+        limit check is needed.
+
+        :return: number of applied translations not yet flushed to disk;
+                 the caller owns the final save
+        """
+        queue = asyncio.Queue()
+        for entry in entries:
+            queue.put_nowait(entry)
+
+        dirty_count = 0
+
+        async def worker():
+            nonlocal dirty_count
+
+            while True:
+                # drain up to batch_size queued entries into one request;
+                # the queue is filled before the workers start, so there is
+                # no need for a flush timeout
+                batch = []
+                while len(batch) < self.batch_size:
+                    try:
+                        batch.append(queue.get_nowait())
+                    except asyncio.QueueEmpty:
+                        break
+                if not batch:
+                    return
+
+                # atomically claim budget for this batch; whatever is left
+                # unclaimed is simply not translated this run
+                claimed = len(batch)
+                if self.limit_translations:
+                    with self._count_lock:
+                        claimed = min(len(batch), max(0, self._remaining_translations))
+                        self._remaining_translations -= claimed
+                    if claimed == 0:
+                        return
+                    batch = batch[:claimed]
+
+                # Apply rate limiting once per batch request
+                await self.wait_for_rate_limit()
+
+                try:
+                    translations = await asyncio.to_thread(
+                        self._translate_texts,
+                        translator,
+                        [entry.msgid for entry in batch],
+                        target_language)
+                except Exception as e:
+                    logger.error(f'Error translating batch: {e}')
+                    if self.limit_translations:
+                        # the batch produced nothing, return its budget
+                        with self._count_lock:
+                            self._remaining_translations += claimed
+                    continue
+
+                for entry, msgstr in zip(batch, translations):
+                    entry.msgstr = msgstr
+                    if self.set_fuzzy:
+                        entry.flags.append('fuzzy')
+
+                    self._cache_store((self.source_language, target_language, entry.msgid), msgstr)
+                    with self._count_lock:
+                        self.translated_count += 1
+                    dirty_count += 1
+                    progress.update(1)
+                    progress.set_postfix_str(entry.msgid[:30])
+
+                # persist the batch's cache rows in one transaction
+                with self._cache_db_lock:
+                    self._cache_conn.commit()
+
+                # checkpoint periodically for crash safety instead of
+                # rewriting the whole file after every batch
+                if dirty_count >= self.save_checkpoint:
+                    po.save()
+                    dirty_count = 0
+
+        workers = [asyncio.ensure_future(worker())
+                   for _ in range(min(self.concurrency, len(entries)))]
+        await asyncio.gather(*workers)
+
+        return dirty_count
+
+    def _translate_texts(self, translator, texts, target_language):
+        """
+        translate a list of texts; runs in a worker thread
+
+        Separator-safe texts are packed into one joined request when they
+        fit the `join_max_chars` budget, which costs one round trip
+        regardless of how many short labels it carries; any part-count
+        mismatch after splitting on the exact separator falls back to the
+        batch endpoint rather than guessing at boundaries. Texts containing
+        `%%` (a valid printf escape in msgids) cannot be packed safely and
+        go through the batch endpoint on their own, without unpacking the
+        rest of their batch.
+        """
+        results = [None] * len(texts)
+
+        packable = [index for index, text in enumerate(texts) if '%%' not in text]
+        unpackable = [index for index, text in enumerate(texts) if '%%' in text]
+
+        pack_texts = [texts[index] for index in packable]
+        packed = None
+        joined = self.join_separator.join(pack_texts)
+        if len(pack_texts) > 1 and len(joined) <= self.join_max_chars:
+            result = translator.translate_string(text=joined,
+                                                 source_language=self.source_language,
+                                                 target_language=target_language)
+
+            parts = result.split(self.join_separator)
+            if len(parts) == len(pack_texts):
+                packed = parts
+            else:
+                logger.warning('batch separator was not preserved by the provider, '
+                               'falling back to per-item batch translation')
+
+        if packed is None and pack_texts:
+            packed = translator.translate_strings(texts=pack_texts,
+                                                  source_language=self.source_language,
+                                                  target_language=target_language)
+
+        for index, msgstr in zip(packable, packed or []):
+            results[index] = msgstr
+
+        if unpackable:
+            translated = translator.translate_strings(texts=[texts[index] for index in unpackable],
+                                                      source_language=self.source_language,
+                                                      target_language=target_language)
+            for index, msgstr in zip(unpackable, translated):
+                results[index] = msgstr
 
-                # Increment counter and save file after each translation
-                self.translated_count += 1
-                po.save()
-                
-                logger.info(f'Translated entry #{self.translated_count}: "{entry.msgid[:50]}..." -> "{entry.msgstr[:50]}..."')
-                
-            except Exception as e:
-                logger.error(f'Error translating "{entry.msgid[:50]}...": {e}')
-                continue
-
-        return True
+        return results
@@ -19,26 +19,48 @@ class BaseTranslatorService:
         Returns a single translated string literal for the target language.
         """
         raise NotImplementedError('.translate_string() must be overridden.')
-    
+
+    def translate_strings(self, texts, target_language, source_language='auto'):
+        """
+        Returns a list of translated string literals for the target language.
+
+        Services backed by a provider with a native batch endpoint should
+        override this; the default simply translates one string at a time.
+        """
+        return [self.translate_string(text, target_language, source_language)
+                for text in texts]
+
 
 class GoogleTranslatorService(BaseTranslatorService):
 
 
     def translate_string(self, text, target_language, source_language='auto'):
-        self.service = GoogleTranslator(source=source_language, target=target_language)
-        
+        service = GoogleTranslator(source=source_language, target=target_language)
+
         assert isinstance(text, str), '`text` should a string literal'
-        return self.service.translate(text)
-    
+        return service.translate(text)
+
+    def translate_strings(self, texts, target_language, source_language='auto'):
+        service = GoogleTranslator(source=source_language, target=target_language)
+
+        assert isinstance(texts, (list, tuple)), '`texts` should be a list of string literals'
+        return service.translate_batch(list(texts))
+
 
 class MyMemoryTranslatorService(BaseTranslatorService):
 
     def translate_string(self, text, target_language, source_language='en'):
-        self.service = MyMemoryTranslator(source=source_language, target=target_language)
-        
+        service = MyMemoryTranslator(source=source_language, target=target_language)
+
         assert isinstance(text, str), '`text` should a string literal'
-        return self.service.translate(text)
-    
+        return service.translate(text)
+
+    def translate_strings(self, texts, target_language, source_language='en'):
+        service = MyMemoryTranslator(source=source_language, target=target_language)
+
+        assert isinstance(texts, (list, tuple)), '`texts` should be a list of string literals'
+        return service.translate_batch(list(texts))
+
 class DeeplTranslatorService(BaseTranslatorService):
 
     # deep-translator uses free deepl api by default. If you have the pro version then simply set the use_free_api to false
@@ -51,7 +73,7 @@ class DeeplTranslatorService(BaseTranslatorService):
                                     'Visit https://www.deepl.com/en/docs-api/ for more information on how to generate your Deepl api key')
 
     def translate_string(self, text, target_language, source_language='en', use_free_api=True):
-        self.service = DeeplTranslator(
+        service = DeeplTranslator(
             source=source_language, 
             target=target_language, 
             api_key=self.developer_key,
@@ -59,8 +81,19 @@ class DeeplTranslatorService(BaseTranslatorService):
         )
         
         assert isinstance(text, str), '`text` should a string literal'
-        return self.service.translate(text)
-    
+        return service.translate(text)
+
+    def translate_strings(self, texts, target_language, source_language='en', use_free_api=True):
+        service = DeeplTranslator(
+            source=source_language,
+            target=target_language,
+            api_key=self.developer_key,
+            use_free_api=getattr(settings, 'DEEPL_FREE_API', use_free_api)
+        )
+
+        assert isinstance(texts, (list, tuple)), '`texts` should be a list of string literals'
+        return service.translate_batch(list(texts))
+
 
 class QcriTranslatorService(BaseTranslatorService):
 
@@ -74,23 +107,29 @@ class QcriTranslatorService(BaseTranslatorService):
                                     'Visit https://mt.qcri.org/api/ for more information')
 
     def translate_string(self, text, target_language, source_language='en'):
-        self.service = QcriTranslator(
+        service = QcriTranslator(
             self.developer_key,
         )
         
         assert isinstance(text, str), '`text` should a string literal'
-        return self.service.translate(source=source_language, 
+        return service.translate(source=source_language, 
             target=target_language, text=text, domain="news")
     
 
 class PonsTranslatorService(BaseTranslatorService):
 
     def translate_string(self, text, target_language, source_language='en'):
-        self.service = PonsTranslator(source=source_language, target=target_language)
-        
+        service = PonsTranslator(source=source_language, target=target_language)
+
         assert isinstance(text, str), '`text` should a string literal'
-        return self.service.translate(text)
-    
+        return service.translate(text)
+
+    def translate_strings(self, texts, target_language, source_language='en'):
+        service = PonsTranslator(source=source_language, target=target_language)
+
+        assert isinstance(texts, (list, tuple)), '`texts` should be a list of string literals'
+        return service.translate_batch(list(texts))
+
 class YandexTranslatorService(BaseTranslatorService):
 
     # You need to require a private api key if you want to use the yandex translator      
@@ -103,12 +142,12 @@ class YandexTranslatorService(BaseTranslatorService):
                                     'You need to require a private api key if you want to use the yandex translator. Visit the official website for more information about how to get one')
 
     def translate_string(self, text, target_language, source_language='en'):
-        self.service = YandexTranslator(
+        service = YandexTranslator(
             self.developer_key,
         )
         
         assert isinstance(text, str), '`text` should a string literal'
-        return self.service.translate(source=source_language, 
+        return service.translate(source=source_language, 
             target=target_language, text=text)
     
 class MicrosoftTranslatorService(BaseTranslatorService):
@@ -127,14 +166,23 @@ class MicrosoftTranslatorService(BaseTranslatorService):
                                     ' information about how to get one. Microsoft offers a free tier 0 subscription (2 million characters per month).')
 
     def translate_string(self, text, target_language):
-        self.service = MicrosoftTranslator(
+        service = MicrosoftTranslator(
             target=target_language, 
             api_key=self.developer_key,
         )
         
         assert isinstance(text, str), '`text` should a string literal'
-        return self.service.translate(text=text)
-    
+        return service.translate(text=text)
+
+    def translate_strings(self, texts, target_language):
+        service = MicrosoftTranslator(
+            target=target_language,
+            api_key=self.developer_key,
+        )
+
+        assert isinstance(texts, (list, tuple)), '`texts` should be a list of string literals'
+        return service.translate_batch(list(texts))
+
 
 class PapagoTranslatorService(BaseTranslatorService):
     """
@@ -158,7 +206,7 @@ class PapagoTranslatorService(BaseTranslatorService):
 
 
     def translate_string(self, text, target_language, source_language="en"):
-        self.service = PapagoTranslator(
+        service = PapagoTranslator(
             target=target_language, 
             source=source_language,
             client_id=self.client_id,
@@ -166,8 +214,19 @@ class PapagoTranslatorService(BaseTranslatorService):
         )
         
         assert isinstance(text, str), '`text` should a string literal'
-        return self.service.translate(text=text)
-    
+        return service.translate(text=text)
+
+    def translate_strings(self, texts, target_language, source_language="en"):
+        service = PapagoTranslator(
+            target=target_language,
+            source=source_language,
+            client_id=self.client_id,
+            secret_key=self.secret_key,
+        )
+
+        assert isinstance(texts, (list, tuple)), '`texts` should be a list of string literals'
+        return service.translate_batch(list(texts))
+
 
 class LibreTranslatorService(BaseTranslatorService):
     """
@@ -177,7 +236,7 @@ class LibreTranslatorService(BaseTranslatorService):
     """
 
     def translate_string(self, text, target_language, source_language="en", ):
-        self.service = LibreTranslator(
+        service = LibreTranslator(
             target=target_language, 
             source=source_language,
             base_url=getattr(settings, 'LIBRE_TRANSLATE_MIRROR_URL', 'https://libretranslate.com/'), 
@@ -185,7 +244,15 @@ class LibreTranslatorService(BaseTranslatorService):
         )
         
         assert isinstance(text, str), '`text` should a string literal'
-        return self.service.translate(text=text)
-    
+        return service.translate(text=text)
 
+    def translate_strings(self, texts, target_language, source_language="en"):
+        service = LibreTranslator(
+            target=target_language,
+            source=source_language,
+            base_url=getattr(settings, 'LIBRE_TRANSLATE_MIRROR_URL', 'https://libretranslate.com/'),
+            api_key=getattr(settings, 'LIBRE_TRANSLATE_KEY', None)
+        )
 
+        assert isinstance(texts, (list, tuple)), '`texts` should be a list of string literals'
+        return service.translate_batch(list(texts))